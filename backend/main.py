@@ -1,5 +1,6 @@
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from toolhouse import Toolhouse
 from groq import Groq
@@ -12,10 +13,51 @@ from datetime import datetime, timedelta
 import pathlib
 import json
 import uuid
+import asyncio
+import time
+import hashlib
+import gzip
+import secrets
+from collections import OrderedDict
+from urllib.parse import quote, urljoin, urlparse
 
 load_dotenv()
 
-URL_TO_SCRAPE = "https://lu.ma/sxsw"
+# Registry of calendars to scrape. Each calendar has a source URL, an inclusive
+# date range that is scraped day by day, and how often (in hours) its stored
+# snapshot should be refreshed by the background scheduler. Set refresh_hours to None
+# to only scrape on demand (the first request without a snapshot, or /scrape).
+CALENDARS = {
+    "sxsw": {
+        "url": "https://lu.ma/sxsw",
+        "start_date": "2025-03-01",
+        "end_date": "2025-03-15",
+        "refresh_hours": 24,
+    },
+}
+DEFAULT_CALENDAR = "sxsw"
+
+# Extra calendars can be registered from a JSON file with the same shape as CALENDARS
+CALENDARS_FILE = os.getenv("CALENDARS_FILE")
+if CALENDARS_FILE:
+    with open(CALENDARS_FILE, "r", encoding="utf-8") as f:
+        CALENDARS.update(json.load(f))
+
+# Global politeness budget shared by every calendar scrape
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "2"))
+SCRAPE_MIN_INTERVAL = float(os.getenv("SCRAPE_MIN_INTERVAL", "1.0"))
+SCRAPE_SCHEDULER_INTERVAL = int(os.getenv("SCRAPE_SCHEDULER_INTERVAL", "300"))
+# Calendars that have not been read for this long are dropped from memory
+CALENDAR_IDLE_SECONDS = int(os.getenv("CALENDAR_IDLE_SECONDS", "1800"))
+
+# Server-sent events: frames buffered per client before it is considered too slow
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+SSE_KEEPALIVE_SECONDS = 15
+# Minimum seconds between audio_chunk progress events for the same event
+SSE_AUDIO_CHUNK_INTERVAL = 0.5
+# Number of events whose latest pipeline progress is kept for clients that reconnect
+PIPELINE_STATE_LIMIT = int(os.getenv("PIPELINE_STATE_LIMIT", "1000"))
+
 app = FastAPI()
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL = "llama-3.3-70b-specdec"
@@ -33,7 +75,11 @@ app.add_middleware(
 # Create directory for events
 EVENTS_DIR = pathlib.Path("../events")
 EVENTS_DIR.mkdir(exist_ok=True, parents=True)
+# Legacy single-calendar snapshot, still read for the default calendar
 EVENTS_FILE = EVENTS_DIR / "events.json"
+# Each calendar gets its own partition under events/calendars/<calendar>/
+CALENDARS_DIR = EVENTS_DIR / "calendars"
+CALENDARS_DIR.mkdir(exist_ok=True, parents=True)
 UPLOAD_DIR = pathlib.Path("../voice-input")
 UPLOAD_DIR.mkdir(exist_ok=True, parents=True)
 # Create directory for event details
@@ -41,230 +87,1047 @@ EVENT_DETAILS_DIR = pathlib.Path("../events/event-details")
 EVENT_DETAILS_DIR.mkdir(exist_ok=True, parents=True)
 AUDIO_DIR = pathlib.Path("../audio")
 AUDIO_DIR.mkdir(exist_ok=True, parents=True)
+# Create directory for resized event cover thumbnails
+IMAGE_CACHE_DIR = pathlib.Path("../image-cache")
+IMAGE_CACHE_DIR.mkdir(exist_ok=True, parents=True)
+
+# Retention policy for generated files: a byte quota, a maximum age in hours and,
+# optionally, how long a file may go unread before it is gzip-compressed
+STORAGE_POLICIES = {
+    "voice-input": {
+        "dir": UPLOAD_DIR,
+        "max_bytes": int(os.getenv("VOICE_INPUT_MAX_BYTES", str(200 * 1024 * 1024))),
+        "max_age_hours": float(os.getenv("VOICE_INPUT_MAX_AGE_HOURS", "24")),
+    },
+    "event-details": {
+        "dir": EVENT_DETAILS_DIR,
+        "max_bytes": int(os.getenv("EVENT_DETAILS_MAX_BYTES", str(100 * 1024 * 1024))),
+        "max_age_hours": float(os.getenv("EVENT_DETAILS_MAX_AGE_HOURS", str(24 * 30))),
+        # Unset to keep event details uncompressed
+        "compress_after_hours": float(os.getenv("EVENT_DETAILS_COMPRESS_AFTER_HOURS")) if os.getenv("EVENT_DETAILS_COMPRESS_AFTER_HOURS") else None,
+    },
+    "audio": {
+        "dir": AUDIO_DIR,
+        "max_bytes": int(os.getenv("AUDIO_MAX_BYTES", str(500 * 1024 * 1024))),
+        "max_age_hours": float(os.getenv("AUDIO_MAX_AGE_HOURS", str(24 * 7))),
+    },
+}
+STORAGE_SWEEP_INTERVAL = int(os.getenv("STORAGE_SWEEP_INTERVAL", "600"))
+# Admin endpoints require this token in the X-Admin-Token header and are disabled when it is unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Cover image proxy settings
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+IMAGE_MAX_SOURCE_BYTES = int(os.getenv("IMAGE_MAX_SOURCE_BYTES", str(15 * 1024 * 1024)))
+IMAGE_MAX_REDIRECTS = 3
+# Path the scraper's image URLs are rewritten to (the frontend forwards it to /image)
+IMAGE_PROXY_PREFIX = os.getenv("IMAGE_PROXY_PREFIX", "/api/image")
+# Only covers from these hosts are proxied
+IMAGE_PROXY_HOSTS = set(os.getenv("IMAGE_PROXY_HOSTS", "lu.ma,images.lumacdn.com,cdn.lu.ma").split(","))
+LUMA_IMAGE_CDN = "https://images.lumacdn.com"
+# Thumbnails fit inside a square bounding box of this many pixels
+THUMBNAIL_SIZES = {"small": 180, "medium": 400, "large": 800}
+THUMBNAIL_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+
+# In-memory snapshots of recently used calendars: {calendar_id: {"data": ..., "last_access": ...}}
+calendar_cache = {}
+# Stored "timestamp" of each calendar's snapshot, kept after the snapshot itself is released
+snapshot_timestamps = {}
+# One lock per calendar so concurrent requests don't trigger duplicate scrapes
+calendar_locks = {}
+# Scrapes started by requests for calendars that have no snapshot yet
+calendar_refresh_tasks = {}
+scrape_semaphore = asyncio.Semaphore(SCRAPE_MAX_CONCURRENCY)
+scrape_interval_lock = asyncio.Lock()
+last_scrape_request = 0.0
+
+# Open /stream connections: {subscriber_id: {"queue", "calendar", "event_id"}}
+sse_subscribers = {}
+# Audiences, so each frame only touches the clients it is meant for:
+# {event_id: {subscriber_id}} for clients following one event, and
+# {calendar or None: {subscriber_id}} for everyone else (None means no calendar filter)
+sse_event_audiences = {}
+sse_calendar_audiences = {}
+# Sent instead of the backlog to clients that fall behind, so they refetch over REST
+SSE_RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+# Latest pipeline progress per event ({event_id: {"stage", "summary", "audio_url", ...}}),
+# replayed to reconnecting clients and served by GET /event-pipeline
+pipeline_states = OrderedDict()
 
-# Function to save events to the common events.json file
-def save_events_to_common_file(events):
-    with open(EVENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump({
-            "timestamp": datetime.now().isoformat(),
-            "url": URL_TO_SCRAPE,
-            "events": events
-        }, f, ensure_ascii=False, indent=2)
+def format_sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def add_sse_subscriber(subscriber_id, subscriber):
+    sse_subscribers[subscriber_id] = subscriber
+    if subscriber["event_id"]:
+        sse_event_audiences.setdefault(subscriber["event_id"], set()).add(subscriber_id)
+    else:
+        sse_calendar_audiences.setdefault(subscriber["calendar"], set()).add(subscriber_id)
+
+def remove_sse_subscriber(subscriber_id):
+    subscriber = sse_subscribers.pop(subscriber_id, None)
+    if not subscriber:
+        return
+    audiences, key = (sse_event_audiences, subscriber["event_id"]) if subscriber["event_id"] else (sse_calendar_audiences, subscriber["calendar"])
+    audience = audiences.get(key)
+    if audience is not None:
+        audience.discard(subscriber_id)
+        if not audience:
+            del audiences[key]
+
+# Function to fan a message out to the /stream clients it is meant for. The frame is
+# serialized once, and a full queue never blocks the publisher. Per-event messages
+# only go to clients following that event; calendar messages go to clients
+# following that calendar, or to clients with no filter at all.
+def publish_event(event_type, data, calendar=None, event_id=None):
+    if event_id:
+        audience = sse_event_audiences.get(event_id, set())
+    elif calendar:
+        audience = sse_calendar_audiences.get(calendar, set()) | sse_calendar_audiences.get(None, set())
+    else:
+        audience = set().union(*sse_calendar_audiences.values())
+    if not audience:
+        return
+    
+    frame = format_sse(event_type, data)
+    for subscriber_id in audience:
+        subscriber = sse_subscribers.get(subscriber_id)
+        if not subscriber:
+            continue
+        
+        queue = subscriber["queue"]
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and ask it to resync
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(SSE_RESYNC_FRAME)
+
+def publish_pipeline_progress(event_id, stage, **details):
+    # A new extraction or pipeline run starts the event's progress over
+    if stage in ("extraction_done", "started") or event_id not in pipeline_states:
+        pipeline_states[event_id] = {"event_id": event_id}
+    state = pipeline_states[event_id]
+    state.update(details, stage=stage)
+    pipeline_states.move_to_end(event_id)
+    while len(pipeline_states) > PIPELINE_STATE_LIMIT:
+        pipeline_states.popitem(last=False)
     
-    return EVENTS_FILE
+    publish_event("pipeline", {"event_id": event_id, "stage": stage, **details}, event_id=event_id)
 
-# Function to load events from the common events.json file
-def load_events_from_common_file():
-    if not EVENTS_FILE.exists():
+def get_event_id(event):
+    return event.get("event_url", "").split("/")[-1].split("?")[0]
+
+# Function to turn a scraped cover src (sometimes only a fragment like
+# "height=180/event-covers/...") into an absolute source URL
+def normalize_image_url(img_src):
+    if not img_src or img_src == "No image found" or img_src.startswith(IMAGE_PROXY_PREFIX):
+        return None
+    
+    # lu.ma serves resized covers through its image CDN; fetch the original cover instead
+    if "event-covers/" in img_src:
+        return f"{LUMA_IMAGE_CDN}/event-covers/{img_src.split('event-covers/', 1)[1]}"
+    
+    # Fix relative URLs by adding base URL
+    if not img_src.startswith(('http://', 'https://')):
+        img_src = f"https://lu.ma{img_src if img_src.startswith('/') else '/' + img_src}"
+    return img_src
+
+# Function to point an event's image_url at the cover image proxy
+def rewrite_event_image_url(event):
+    source_url = normalize_image_url(event.get("image_url"))
+    if source_url:
+        event["source_image_url"] = source_url
+        event["image_url"] = f"{IMAGE_PROXY_PREFIX}?url={quote(source_url, safe='')}"
+    return event
+
+# Function to resolve the calendar parameter of an API call to a registry key
+def resolve_calendar(calendar: Optional[str] = None):
+    calendar_id = calendar or DEFAULT_CALENDAR
+    return calendar_id if calendar_id in CALENDARS else None
+
+def get_calendar_events_file(calendar_id):
+    return CALENDARS_DIR / calendar_id / "events.json"
+
+# Function to save events to the calendar's events.json file
+def save_events_to_calendar_file(calendar_id, events):
+    # Keep the previous event IDs so subscribers get a diff of the new snapshot
+    previous_data = calendar_cache[calendar_id]["data"] if calendar_id in calendar_cache else read_calendar_file(calendar_id)
+    previous_ids = {get_event_id(event) for event in previous_data["events"]} if previous_data else set()
+    
+    events_file = get_calendar_events_file(calendar_id)
+    events_file.parent.mkdir(exist_ok=True, parents=True)
+    events_data = {
+        "timestamp": datetime.now().isoformat(),
+        "calendar": calendar_id,
+        "url": CALENDARS[calendar_id]["url"],
+        "events": events
+    }
+    with open(events_file, "w", encoding="utf-8") as f:
+        json.dump(events_data, f, ensure_ascii=False, indent=2)
+    snapshot_timestamps[calendar_id] = events_data["timestamp"]
+    
+    # Only refresh the in-memory copy if someone is actively reading this calendar
+    if calendar_id in calendar_cache:
+        calendar_cache[calendar_id] = {"data": events_data, "last_access": time.monotonic()}
+    
+    current_ids = {get_event_id(event) for event in events}
+    publish_event("snapshot", {
+        "calendar": calendar_id,
+        "version": events_data["timestamp"],
+        "added": sorted(current_ids - previous_ids),
+        "removed": sorted(previous_ids - current_ids)
+    }, calendar=calendar_id)
+    
+    return events_file
+
+def read_calendar_file(calendar_id):
+    events_file = get_calendar_events_file(calendar_id)
+    if not events_file.exists() and calendar_id == DEFAULT_CALENDAR:
+        events_file = EVENTS_FILE
+    if not events_file.exists():
         return None
     
     try:
-        with open(EVENTS_FILE, "r", encoding="utf-8") as f:
+        with open(events_file, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
-        print(f"Error loading events file {EVENTS_FILE}: {e}")
+        print(f"Error loading events file {events_file}: {e}")
         return None
 
-@app.get("/scrape")
-async def scrape_events():
-    """Scrape events from URL_TO_SCRAPE using BeautifulSoup and save to common events.json file"""
-    try:
-        all_events = []
+# Function to load events from the calendar's events.json file
+def load_events_from_calendar_file(calendar_id):
+    cached = calendar_cache.get(calendar_id)
+    if cached:
+        cached["last_access"] = time.monotonic()
+        return cached["data"]
+    
+    events_data = read_calendar_file(calendar_id)
+    if not events_data:
+        return None
+    
+    # Older snapshots were saved before image URLs went through the proxy
+    for event in events_data.get("events", []):
+        rewrite_event_image_url(event)
+    
+    calendar_cache[calendar_id] = {"data": events_data, "last_access": time.monotonic()}
+    return events_data
+
+# Function to get when a calendar was last scraped without loading its events
+# The stored "timestamp" doubles as the snapshot version sent to /stream clients
+def get_snapshot_version(calendar_id):
+    if calendar_id not in snapshot_timestamps:
+        cached = calendar_cache.get(calendar_id)
+        events_data = cached["data"] if cached else read_calendar_file(calendar_id)
+        if not events_data:
+            return None
+        snapshot_timestamps[calendar_id] = events_data["timestamp"]
+    
+    return snapshot_timestamps[calendar_id]
+
+def get_snapshot_timestamp(calendar_id):
+    version = get_snapshot_version(calendar_id)
+    return datetime.fromisoformat(version) if version else None
+
+def calendar_refresh_due(calendar_id):
+    timestamp = get_snapshot_timestamp(calendar_id)
+    if timestamp is None:
+        return True
+    refresh_hours = CALENDARS[calendar_id].get("refresh_hours")
+    if not refresh_hours:
+        return False
+    return timestamp < datetime.now() - timedelta(hours=refresh_hours)
+
+# Function to drop calendars nobody has read recently from memory
+def release_inactive_calendars():
+    cutoff = time.monotonic() - CALENDAR_IDLE_SECONDS
+    for calendar_id in [cid for cid, entry in calendar_cache.items() if entry["last_access"] < cutoff]:
+        print(f"Releasing inactive calendar {calendar_id} from memory")
+        del calendar_cache[calendar_id]
+
+# Function to fetch a page within the global politeness budget
+async def polite_get(url):
+    global last_scrape_request
+    async with scrape_semaphore:
+        # Space out request starts across all calendars
+        async with scrape_interval_lock:
+            wait = last_scrape_request + SCRAPE_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            last_scrape_request = time.monotonic()
         
-        # Scrape each day from March 1 to March 16
-        for day in range(1, 16):
-            # Format the date for the URL
-            date_str = f"2024-03-{day:02d}"
-            day_url = f"{URL_TO_SCRAPE}?date={date_str}"
-            
-            print(f"Scraping events for {date_str} from {day_url}")
-            
-            # Send a GET request to the URL for this specific day
-            response = requests.get(day_url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
+        response = await asyncio.to_thread(requests.get, url, timeout=30)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        return response
+
+# Function to parse the event cards out of a single day's calendar page
+def parse_day_events(html, fallback_date):
+    # Parse the HTML content
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find all event containers
+    event_containers = soup.select('div.jsx-2926199791.card-wrapper')
+    
+    # Also find all date sections to associate events with their dates
+    date_sections = soup.select('div.jsx-129232405.timeline-section.sticky-always')
+    date_map = {}
+    
+    # Extract dates from date sections
+    for section in date_sections:
+        date_elem = section.select_one('div.jsx-3877914823.date')
+        if date_elem:
+            date_text = date_elem.text.strip()
+            # Find all event cards that follow this date section until the next date section
+            next_elements = section.find_next_siblings()
+            for elem in next_elements:
+                if 'timeline-section' in elem.get('class', []):
+                    break
+                cards = elem.select('div.jsx-2926199791.card-wrapper')
+                for card in cards:
+                    date_map[card] = date_text
+    
+    day_events = []
+    for container in event_containers:
+        event = {}
+        
+        # Extract title
+        title_elem = container.select_one('h3')
+        event['title'] = title_elem.text.strip() if title_elem else "No title found"
+        
+        # Extract hosts
+        host_elem = container.select_one('div.text-ellipses.nowrap')
+        if host_elem:
+            host_text = host_elem.text.strip()
+            if host_text.startswith('By '):
+                host_text = host_text[3:]  # Remove 'By ' prefix
+            event['hosts'] = host_text
+        else:
+            event['hosts'] = "No host found"
+        
+        # Extract date and time
+        time_elem = container.select_one('div.jsx-749509546 span')
+        
+        # Get date from our date_map or use the current day we're scraping
+        event_date = date_map.get(container, fallback_date)
+        
+        if time_elem:
+            time_text = time_elem.text.strip()
+            event['date_time'] = f"{event_date}, {time_text}"
+        else:
+            event['date_time'] = event_date
+        
+        # Extract location
+        location_elem = container.select_one('div.jsx-3575689807.text-ellipses:not(.nowrap)')
+        event['location'] = location_elem.text.strip() if location_elem else "No location found"
+        
+        # Extract image URL and serve it through the cover image proxy
+        img_elem = container.select_one('img')
+        if img_elem and 'src' in img_elem.attrs:
+            event['image_url'] = img_elem['src']
+            rewrite_event_image_url(event)
+        else:
+            event['image_url'] = "No image found"
+        
+        # Extract event URL
+        link_elem = container.select_one('a.event-link')
+        if link_elem and 'href' in link_elem.attrs:
+            event['event_url'] = 'https://lu.ma' + link_elem['href'] if link_elem['href'].startswith('/') else link_elem['href']
+        else:
+            event['event_url'] = "No URL found"
+        
+        # Extract price if available
+        price_elem = container.select_one('div.jsx-1669635041.pill-label')
+        if price_elem:
+            event['price'] = price_elem.text.strip()
+        else:
+            event['price'] = "Free or not specified"
+        
+        day_events.append(event)
+    
+    return day_events
+
+async def scrape_calendar_day(calendar_id, day):
+    calendar_url = CALENDARS[calendar_id]["url"]
+    date_str = day.isoformat()
+    day_url = f"{calendar_url}?date={date_str}"
+    
+    print(f"Scraping {calendar_id} events for {date_str} from {day_url}")
+    
+    # Send a GET request to the URL for this specific day
+    response = await polite_get(day_url)
+    day_events = await asyncio.to_thread(parse_day_events, response.text, f"{day.strftime('%B')} {day.day}")
+    
+    print(f"Found {len(day_events)} {calendar_id} events for {date_str}")
+    return day_events
+
+# Function to scrape every day of a calendar's date range and save the snapshot
+async def refresh_calendar(calendar_id, force=False):
+    calendar = CALENDARS[calendar_id]
+    lock = calendar_locks.setdefault(calendar_id, asyncio.Lock())
+    async with lock:
+        # Another request may have refreshed this calendar while we were waiting
+        if not force and not calendar_refresh_due(calendar_id):
+            events_data = load_events_from_calendar_file(calendar_id)
+            return {
+                "message": f"Calendar {calendar_id} is already up to date",
+                "events": events_data["events"] if events_data else [],
+            }
+        
+        try:
+            start_date = datetime.strptime(calendar["start_date"], "%Y-%m-%d").date()
+            end_date = datetime.strptime(calendar["end_date"], "%Y-%m-%d").date()
+            days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
             
-            # Find all event containers
-            event_containers = soup.select('div.jsx-2926199791.card-wrapper')
+            # Days are fetched concurrently; polite_get keeps us within the global budget.
+            # Every day task finishes before we return, so none outlive the calendar lock.
+            day_results = await asyncio.gather(
+                *(scrape_calendar_day(calendar_id, day) for day in days),
+                return_exceptions=True
+            )
             
-            # Also find all date sections to associate events with their dates
-            date_sections = soup.select('div.jsx-129232405.timeline-section.sticky-always')
-            date_map = {}
+            # Keep the previous snapshot rather than saving a partial one
+            failed_days = [(day, result) for day, result in zip(days, day_results) if isinstance(result, BaseException)]
+            if failed_days:
+                for day, error in failed_days:
+                    print(f"Error scraping {calendar_id} events for {day.isoformat()}: {error}")
+                message = f"Error scraping events: {len(failed_days)} of {len(days)} days failed ({failed_days[0][1]})"
+                publish_event("scrape_error", {"calendar": calendar_id, "message": message}, calendar=calendar_id)
+                return {
+                    "message": message,
+                    "failed_days": [day.isoformat() for day, _ in failed_days],
+                    "events": []
+                }
             
-            # Extract dates from date sections
-            for section in date_sections:
-                date_elem = section.select_one('div.jsx-3877914823.date')
-                if date_elem:
-                    date_text = date_elem.text.strip()
-                    # Find all event cards that follow this date section until the next date section
-                    next_elements = section.find_next_siblings()
-                    for elem in next_elements:
-                        if 'timeline-section' in elem.get('class', []):
-                            break
-                        cards = elem.select('div.jsx-2926199791.card-wrapper')
-                        for card in cards:
-                            date_map[card] = date_text
+            all_events = [event for day_events in day_results for event in day_events]
             
-            day_events = []
-            for container in event_containers:
-                event = {}
-                
-                # Extract title
-                title_elem = container.select_one('h3')
-                event['title'] = title_elem.text.strip() if title_elem else "No title found"
-                
-                # Extract hosts
-                host_elem = container.select_one('div.text-ellipses.nowrap')
-                if host_elem:
-                    host_text = host_elem.text.strip()
-                    if host_text.startswith('By '):
-                        host_text = host_text[3:]  # Remove 'By ' prefix
-                    event['hosts'] = host_text
-                else:
-                    event['hosts'] = "No host found"
-                
-                # Extract date and time
-                time_elem = container.select_one('div.jsx-749509546 span')
-                
-                # Get date from our date_map or use the current day we're scraping
-                event_date = date_map.get(container, f"March {day}")
-                
-                if time_elem:
-                    time_text = time_elem.text.strip()
-                    event['date_time'] = f"{event_date}, {time_text}"
-                else:
-                    event['date_time'] = event_date
-                
-                # Extract location
-                location_elem = container.select_one('div.jsx-3575689807.text-ellipses:not(.nowrap)')
-                event['location'] = location_elem.text.strip() if location_elem else "No location found"
-                
-                # Extract image URL
-                img_elem = container.select_one('img')
-                if img_elem and 'src' in img_elem.attrs:
-                    img_src = img_elem['src']
-                    # Fix relative URLs by adding base URL
-                    if not img_src.startswith(('http://', 'https://')):
-                        img_src = f"https://lu.ma{img_src if img_src.startswith('/') else '/' + img_src}"
-                    event['image_url'] = img_src
-                else:
-                    event['image_url'] = "No image found"
-                
-                # Extract event URL
-                link_elem = container.select_one('a.event-link')
-                if link_elem and 'href' in link_elem.attrs:
-                    event['event_url'] = 'https://lu.ma' + link_elem['href'] if link_elem['href'].startswith('/') else link_elem['href']
-                else:
-                    event['event_url'] = "No URL found"
-                
-                # Extract price if available
-                price_elem = container.select_one('div.jsx-1669635041.pill-label')
-                if price_elem:
-                    event['price'] = price_elem.text.strip()
-                else:
-                    event['price'] = "Free or not specified"
-                
-                day_events.append(event)
+            # Save the scraped events to the calendar's partition
+            events_file = save_events_to_calendar_file(calendar_id, all_events)
             
-            print(f"Found {len(day_events)} events for {date_str}")
-            all_events.extend(day_events)
-        
-        # Save the scraped events to the common file
-        common_file = save_events_to_common_file(all_events)
+            return {
+                "message": f"Successfully scraped {len(all_events)} events from {calendar['url']} for {calendar['start_date']} to {calendar['end_date']}",
+                "events": all_events,
+                "saved_to": str(events_file)
+            }
         
-        return {
-            "message": f"Successfully scraped {len(all_events)} events from {URL_TO_SCRAPE} for March 1-16",
-            "events": all_events,
-            "saved_to": str(common_file)
-        }
+        except Exception as e:
+            import traceback
+            publish_event("scrape_error", {"calendar": calendar_id, "message": str(e)}, calendar=calendar_id)
+            return {
+                "message": f"Error scraping events: {str(e)}",
+                "traceback": traceback.format_exc(),
+                "events": []
+            }
+
+# Function to scrape a calendar in the background unless that is already happening;
+# clients hear about the result through /stream
+def start_calendar_refresh(calendar_id):
+    if calendar_id not in calendar_refresh_tasks:
+        task = asyncio.create_task(refresh_calendar(calendar_id))
+        calendar_refresh_tasks[calendar_id] = task
+        task.add_done_callback(lambda _: calendar_refresh_tasks.pop(calendar_id, None))
+
+# Background task that refreshes due calendars and releases inactive ones
+async def calendar_scheduler():
+    while True:
+        try:
+            # Calendars without a refresh cadence are only scraped on demand
+            due = [
+                calendar_id for calendar_id, calendar in CALENDARS.items()
+                if calendar.get("refresh_hours") and calendar_refresh_due(calendar_id)
+            ]
+            if due:
+                print(f"Scheduled refresh for calendars: {', '.join(due)}")
+                await asyncio.gather(*(refresh_calendar(calendar_id) for calendar_id in due))
+            release_inactive_calendars()
+        except Exception as e:
+            print(f"Error in calendar scheduler: {e}")
+        await asyncio.sleep(SCRAPE_SCHEDULER_INTERVAL)
+
+@app.on_event("startup")
+async def start_calendar_scheduler():
+    app.state.calendar_scheduler = asyncio.create_task(calendar_scheduler())
+
+@app.get("/calendars")
+async def list_calendars():
+    """List the registered calendars and the state of their snapshots"""
+    calendars = []
+    for calendar_id, calendar in CALENDARS.items():
+        timestamp = get_snapshot_timestamp(calendar_id)
+        calendars.append({
+            "id": calendar_id,
+            **calendar,
+            "last_scraped": timestamp.isoformat() if timestamp else None,
+            "loaded": calendar_id in calendar_cache,
+            "refresh_due": calendar_refresh_due(calendar_id)
+        })
     
-    except Exception as e:
-        import traceback
+    return {
+        "default": DEFAULT_CALENDAR,
+        "calendars": calendars
+    }
+
+@app.get("/scrape")
+async def scrape_events(calendar: str = None):
+    """Scrape a calendar's events using BeautifulSoup and save them to its events.json file"""
+    calendar_id = resolve_calendar(calendar)
+    if not calendar_id:
         return {
-            "message": f"Error scraping events: {str(e)}",
-            "traceback": traceback.format_exc(),
+            "message": f"Unknown calendar: {calendar}",
             "events": []
         }
+    
+    return await refresh_calendar(calendar_id, force=True)
 
 @app.get("/events-list")
-async def get_events_list():
-    """Get events list from common events.json file or scrape if none are present"""
-    # Try to load events from common file
-    events_data = load_events_from_common_file()
-    
-    # If no events found or the file is older than 24 hours, scrape new events
-    if not events_data or (
-        datetime.fromisoformat(events_data["timestamp"]) < 
-        datetime.now() - timedelta(hours=24)
-    ):
-        # Call the scrape endpoint to get fresh data
-        scrape_result = await scrape_events()
-        
-        if scrape_result.get("events"):
-            return {
-                "message": f"Successfully scraped {len(scrape_result['events'])} events from {URL_TO_SCRAPE}",
-                "source": "fresh_scrape",
-                "events": scrape_result["events"]
-            }
-        else:
-            return {
-                "message": "Failed to scrape events",
-                "source": "error",
-                "events": []
-            }
+async def get_events_list(calendar: str = None):
+    """Get a calendar's events from its events.json file, starting a background scrape if none are present.
+    Stale snapshots are still served; calendar_scheduler refreshes them in the background."""
+    calendar_id = resolve_calendar(calendar)
+    if not calendar_id:
+        return {
+            "message": f"Unknown calendar: {calendar}",
+            "source": "error",
+            "events": []
+        }
     
-    # Return the events from common file
+    # Without a snapshot, scrape in the background; a full date range takes longer than
+    # the frontend proxy waits, so clients get a snapshot event on /stream when it is ready
+    if get_snapshot_timestamp(calendar_id) is None:
+        start_calendar_refresh(calendar_id)
+        return {
+            "message": f"Scraping events from {CALENDARS[calendar_id]['url']}",
+            "source": "scraping",
+            "calendar": calendar_id,
+            "events": []
+        }
+    
+    events_data = load_events_from_calendar_file(calendar_id)
+    if not events_data:
+        return {
+            "message": "Failed to load events",
+            "source": "error",
+            "events": []
+        }
+    
+    # Return the events from the calendar file
     return {
-        "message": f"Loaded {len(events_data['events'])} events from common file",
-        "source": "common_file",
+        "message": f"Loaded {len(events_data['events'])} events from calendar file",
+        "source": "calendar_file",
+        "calendar": calendar_id,
         "timestamp": events_data["timestamp"],
         "events": events_data["events"]
     }
 
 @app.get("/events")
-async def get_events():
+async def get_events(calendar: str = None):
     """Get a simplified list of event titles for the EventRoller"""
-    # Try to load events from common file or get them from events-list
-    events_data = load_events_from_common_file()
-    
-    if not events_data or (
-        datetime.fromisoformat(events_data["timestamp"]) < 
-        datetime.now() - timedelta(hours=24)
-    ):
-        # Call events-list to get or refresh the data
-        events_list_result = await get_events_list()
-        
-        if events_list_result.get("events"):
-            # Return simplified event data
-            simplified_events = [
-                {"title": event["title"], "host": event.get("hosts", "")} 
-                for event in events_list_result["events"]
-            ]
+    # Get or refresh the calendar's events through events-list
+    events_list_result = await get_events_list(calendar)
+    
+    if events_list_result.get("events"):
+        # Return simplified event data
+        simplified_events = [
+            {"title": event["title"], "host": event.get("hosts", "")} 
+            for event in events_list_result["events"]
+        ]
+        
+        return {
+            "message": f"Loaded {len(simplified_events)} events",
+            "source": events_list_result.get("source", "events_list"),
+            "calendar": events_list_result.get("calendar"),
+            "events": simplified_events
+        }
+    
+    return {
+        "message": events_list_result.get("message", "Failed to load events"),
+        "source": "scraping" if events_list_result.get("source") == "scraping" else "error",
+        "calendar": events_list_result.get("calendar"),
+        "events": []
+    }
+
+# LRU index of cached thumbnails: {file_name: (size_in_bytes, etag)}, least recently used first
+image_cache_index = OrderedDict()
+image_cache_bytes = 0
+# One lock per source image so concurrent requests only fetch it once:
+# {cache_key: {"lock": asyncio.Lock, "waiters": number of requests using it}}
+image_fetch_locks = {}
+
+def get_image_etag(path):
+    stat = path.stat()
+    return f'"{hashlib.md5(f"{path.name}-{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest()}"'
+
+def add_to_image_cache(path):
+    global image_cache_bytes
+    if path.name in image_cache_index:
+        image_cache_bytes -= image_cache_index.pop(path.name)[0]
+    size = path.stat().st_size
+    image_cache_index[path.name] = (size, get_image_etag(path))
+    image_cache_bytes += size
+
+def drop_from_image_cache(file_name):
+    global image_cache_bytes
+    entry = image_cache_index.pop(file_name, None)
+    if entry:
+        image_cache_bytes -= entry[0]
+
+# Function to evict least recently used thumbnails until the cache fits its budget
+def evict_image_cache():
+    global image_cache_bytes
+    while image_cache_bytes > IMAGE_CACHE_MAX_BYTES and len(image_cache_index) > 1:
+        file_name, (size, _) = image_cache_index.popitem(last=False)
+        image_cache_bytes -= size
+        (IMAGE_CACHE_DIR / file_name).unlink(missing_ok=True)
+
+# Build the LRU index once at startup so requests never need to scan the cache directory
+@app.on_event("startup")
+async def load_image_cache_index():
+    # Remove thumbnails left half-written by an interrupted resize
+    for path in IMAGE_CACHE_DIR.glob("*.tmp"):
+        path.unlink(missing_ok=True)
+    
+    files = [path for path in IMAGE_CACHE_DIR.iterdir() if path.is_file()]
+    for path in sorted(files, key=lambda path: path.stat().st_atime):
+        add_to_image_cache(path)
+    evict_image_cache()
+    print(f"Loaded {len(image_cache_index)} cached thumbnails ({image_cache_bytes} bytes)")
+
+# Function to resize a source image into every thumbnail size and format
+def generate_thumbnails(cache_key, data):
+    from io import BytesIO
+    from PIL import Image
+    
+    image = Image.open(BytesIO(data))
+    image.load()
+    
+    paths = []
+    for size_name, max_side in THUMBNAIL_SIZES.items():
+        thumbnail = image.copy()
+        thumbnail.thumbnail((max_side, max_side))
+        for extension, (pil_format, _) in THUMBNAIL_FORMATS.items():
+            if pil_format == "JPEG" or "A" not in thumbnail.getbands():
+                output = thumbnail.convert("RGB")
+            else:
+                output = thumbnail.convert("RGBA")
             
-            return {
-                "message": f"Loaded {len(simplified_events)} events",
-                "source": events_list_result.get("source", "events_list"),
-                "events": simplified_events
-            }
+            # Write to a temporary file first so readers never see a partial thumbnail
+            path = IMAGE_CACHE_DIR / f"{cache_key}-{size_name}.{extension}"
+            tmp_path = path.with_name(path.name + ".tmp")
+            try:
+                output.save(tmp_path, format=pil_format, quality=80)
+                os.replace(tmp_path, path)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            paths.append(path)
+    
+    return paths
+
+def is_allowed_image_url(url):
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and parsed.hostname in IMAGE_PROXY_HOSTS
+
+# Function to download a source image, following redirects only to allowed hosts
+# and never reading more than IMAGE_MAX_SOURCE_BYTES
+def download_source_image(source_url):
+    url = source_url
+    for _ in range(IMAGE_MAX_REDIRECTS + 1):
+        with requests.get(url, timeout=30, stream=True, allow_redirects=False) as response:
+            if response.is_redirect:
+                url = urljoin(url, response.headers["location"])
+                if not is_allowed_image_url(url):
+                    raise ValueError(f"Image redirected to a host that is not allowed: {url}")
+                continue
+            
+            response.raise_for_status()
+            if int(response.headers.get("content-length") or 0) > IMAGE_MAX_SOURCE_BYTES:
+                raise ValueError(f"Source image is larger than {IMAGE_MAX_SOURCE_BYTES} bytes")
+            
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                data.extend(chunk)
+                if len(data) > IMAGE_MAX_SOURCE_BYTES:
+                    raise ValueError(f"Source image is larger than {IMAGE_MAX_SOURCE_BYTES} bytes")
+            return bytes(data)
+    
+    raise ValueError(f"Too many redirects fetching {source_url}")
+
+async def fetch_thumbnails(source_url, cache_key):
+    data = await asyncio.to_thread(download_source_image, source_url)
+    for path in await asyncio.to_thread(generate_thumbnails, cache_key, data):
+        add_to_image_cache(path)
+    evict_image_cache()
+
+@app.get("/image")
+async def get_image(request: Request, url: str = None, size: str = "medium", format: str = None):
+    """Serve a resized event cover, fetching and caching its thumbnails on first use"""
+    if not url:
+        return JSONResponse({"status": "error", "message": "Missing required parameter: url"}, status_code=422)
+    
+    source_url = normalize_image_url(url)
+    if not source_url or not is_allowed_image_url(source_url):
+        return JSONResponse({"status": "error", "message": f"Image host not allowed: {url}"}, status_code=400)
+    
+    if size not in THUMBNAIL_SIZES:
+        return JSONResponse({"status": "error", "message": f"Unknown size: {size}"}, status_code=422)
+    
+    # Prefer WebP when the browser accepts it
+    if not format:
+        format = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+    if format not in THUMBNAIL_FORMATS:
+        return JSONResponse({"status": "error", "message": f"Unknown format: {format}"}, status_code=422)
+    
+    cache_key = hashlib.sha256(source_url.encode("utf-8")).hexdigest()
+    file_name = f"{cache_key}-{size}.{format}"
+    path = IMAGE_CACHE_DIR / file_name
+    
+    # A concurrent fetch can evict the file between the index check and the read,
+    # so regenerate it once before giving up
+    for _ in range(2):
+        if file_name not in image_cache_index or not path.exists():
+            fetch = image_fetch_locks.setdefault(cache_key, {"lock": asyncio.Lock(), "waiters": 0})
+            fetch["waiters"] += 1
+            try:
+                async with fetch["lock"]:
+                    # Another request may have generated the thumbnails while we were waiting
+                    if file_name not in image_cache_index or not path.exists():
+                        print(f"Fetching cover image {source_url}")
+                        await fetch_thumbnails(source_url, cache_key)
+            except Exception as e:
+                print(f"Error fetching cover image {source_url}: {e}")
+                return JSONResponse({"status": "error", "message": f"Failed to fetch image: {str(e)}"}, status_code=502)
+            finally:
+                # Keep the lock while any other request is still waiting on it
+                fetch["waiters"] -= 1
+                if not fetch["waiters"]:
+                    image_fetch_locks.pop(cache_key, None)
+        
+        # Only happens when IMAGE_CACHE_MAX_BYTES is smaller than one image's thumbnails
+        if file_name not in image_cache_index:
+            return JSONResponse({"status": "error", "message": "Image cache is too small to hold this image"}, status_code=507)
+        
+        image_cache_index.move_to_end(file_name)
+        _, etag = image_cache_index[file_name]
+        headers = {
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": etag,
+            "Vary": "Accept",
+        }
+        
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        try:
+            content = await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            drop_from_image_cache(file_name)
+            continue
+        
+        return Response(content=content, media_type=THUMBNAIL_FORMATS[format][1], headers=headers)
+    
+    return JSONResponse({"status": "error", "message": "Image was evicted while it was being served, please retry"}, status_code=503)
+
+# Index of stored files per directory so eviction never needs a directory scan:
+# {store: {file_name: {"size", "modified", "last_access"}}}, least recently used first
+storage_index = {store: OrderedDict() for store in STORAGE_POLICIES}
+storage_bytes = {store: 0 for store in STORAGE_POLICIES}
+storage_stats = {
+    store: {"evicted_by_age": 0, "evicted_by_quota": 0, "compressed": 0, "last_sweep": None}
+    for store in STORAGE_POLICIES
+}
+storage_sweep_locks = {store: asyncio.Lock() for store in STORAGE_POLICIES}
+
+# Function to add or refresh a file in the storage index after it was written
+def record_file_write(store, path):
+    index = storage_index[store]
+    if path.name in index:
+        storage_bytes[store] -= index.pop(path.name)["size"]
+    stat = path.stat()
+    index[path.name] = {"size": stat.st_size, "modified": stat.st_mtime, "last_access": time.time()}
+    storage_bytes[store] += stat.st_size
+
+# Function to mark a file as recently used
+def record_file_access(store, path):
+    entry = storage_index[store].get(path.name)
+    if entry is None:
+        if path.exists():
+            record_file_write(store, path)
+        return
+    entry["last_access"] = time.time()
+    storage_index[store].move_to_end(path.name)
+
+def remove_stored_file(store, file_name):
+    entry = storage_index[store].pop(file_name, None)
+    if entry:
+        storage_bytes[store] -= entry["size"]
+    (STORAGE_POLICIES[store]["dir"] / file_name).unlink(missing_ok=True)
+
+# Function to find an event's details file, which may have been compressed
+def get_event_details_path(event_id):
+    event_file_path = EVENT_DETAILS_DIR / f"{event_id}.txt"
+    if event_file_path.exists():
+        return event_file_path
+    compressed_path = event_file_path.with_name(event_file_path.name + ".gz")
+    return compressed_path if compressed_path.exists() else None
+
+def read_event_details_file(event_file_path):
+    try:
+        if event_file_path.suffix == ".gz":
+            with gzip.open(event_file_path, "rt", encoding="utf-8") as f:
+                content = f.read()
         else:
-            return {
-                "message": "Failed to load events",
-                "source": "error",
-                "events": []
-            }
+            with open(event_file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+    except FileNotFoundError:
+        if event_file_path.suffix == ".gz":
+            raise
+        # A storage sweep compressed the file after we found it
+        event_file_path = event_file_path.with_name(event_file_path.name + ".gz")
+        with gzip.open(event_file_path, "rt", encoding="utf-8") as f:
+            content = f.read()
     
-    # Return simplified event data from common file
-    simplified_events = [
-        {"title": event["title"], "host": event.get("hosts", "")} 
-        for event in events_data["events"]
-    ]
+    record_file_access("event-details", event_file_path)
+    return content
+
+# Function to gzip a file, leaving it alone if it is rewritten while being compressed
+def compress_file(path, expected_mtime):
+    stat = path.stat()
+    if stat.st_mtime != expected_mtime:
+        return None
+    
+    compressed_path = path.with_name(path.name + ".gz")
+    with open(path, "rb") as f_in, gzip.open(compressed_path, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    
+    if path.stat().st_mtime != expected_mtime:
+        compressed_path.unlink(missing_ok=True)
+        return None
+    
+    os.utime(compressed_path, (stat.st_atime, stat.st_mtime))
+    path.unlink()
+    return compressed_path
+
+# Function to apply a directory's retention policy using only the index
+async def sweep_storage(store):
+    # The background task and /admin/storage/sweep must not sweep the same store at once
+    async with storage_sweep_locks[store]:
+        policy = STORAGE_POLICIES[store]
+        index = storage_index[store]
+        stats = storage_stats[store]
+        now = time.time()
+        
+        # Age-based eviction
+        if policy.get("max_age_hours"):
+            cutoff = now - policy["max_age_hours"] * 3600
+            for file_name in [name for name, entry in index.items() if entry["modified"] < cutoff]:
+                remove_stored_file(store, file_name)
+                stats["evicted_by_age"] += 1
+        
+        # Compress files that have not been read for a while
+        if policy.get("compress_after_hours"):
+            cutoff = now - policy["compress_after_hours"] * 3600
+            for file_name in [name for name, entry in index.items() if entry["last_access"] < cutoff and not name.endswith(".gz")]:
+                entry = index[file_name]
+                try:
+                    compressed_path = await asyncio.to_thread(compress_file, policy["dir"] / file_name, entry["modified"])
+                except FileNotFoundError:
+                    remove_stored_file(store, file_name)
+                    continue
+                
+                # Skip files that were rewritten (and re-indexed) in the meantime
+                if compressed_path is None:
+                    if index.get(file_name) is entry:
+                        record_file_write(store, policy["dir"] / file_name)
+                    continue
+                if index.get(file_name) is not entry:
+                    compressed_path.unlink(missing_ok=True)
+                    continue
+                
+                remove_stored_file(store, file_name)
+                record_file_write(store, compressed_path)
+                # Keep the compressed file in the original's LRU position
+                index[compressed_path.name]["last_access"] = entry["last_access"]
+                index.move_to_end(compressed_path.name, last=False)
+                stats["compressed"] += 1
+        
+        # LRU eviction down to the quota
+        while storage_bytes[store] > policy["max_bytes"] and index:
+            file_name = next(iter(index))
+            remove_stored_file(store, file_name)
+            stats["evicted_by_quota"] += 1
+        
+        stats["last_sweep"] = datetime.now().isoformat()
+
+# Background task that applies every retention policy
+async def storage_manager():
+    while True:
+        for store in STORAGE_POLICIES:
+            try:
+                await sweep_storage(store)
+            except Exception as e:
+                print(f"Error sweeping {store} storage: {e}")
+        await asyncio.sleep(STORAGE_SWEEP_INTERVAL)
+
+# Build the storage index once at startup, then keep it up to date on every read and write
+@app.on_event("startup")
+async def start_storage_manager():
+    for store, policy in STORAGE_POLICIES.items():
+        files = [path for path in policy["dir"].iterdir() if path.is_file()]
+        for path in sorted(files, key=lambda path: max(path.stat().st_atime, path.stat().st_mtime)):
+            record_file_write(store, path)
+            storage_index[store][path.name]["last_access"] = max(path.stat().st_atime, path.stat().st_mtime)
+        print(f"Indexed {len(storage_index[store])} {store} files ({storage_bytes[store]} bytes)")
+    app.state.storage_manager = asyncio.create_task(storage_manager())
+
+def get_storage_stats():
+    return {
+        store: {
+            "files": len(storage_index[store]),
+            "bytes": storage_bytes[store],
+            "max_bytes": policy["max_bytes"],
+            "max_age_hours": policy.get("max_age_hours"),
+            "compress_after_hours": policy.get("compress_after_hours"),
+            **storage_stats[store]
+        }
+        for store, policy in STORAGE_POLICIES.items()
+    }
+
+def check_admin_token(request):
+    token = request.headers.get("x-admin-token", "")
+    if not ADMIN_TOKEN or not secrets.compare_digest(token, ADMIN_TOKEN):
+        return JSONResponse({"status": "error", "message": "Admin token required"}, status_code=403)
+    return None
+
+@app.get("/admin/storage")
+async def storage_status(request: Request):
+    """Report usage and eviction stats for the voice-input, event-details and audio directories"""
+    denied = check_admin_token(request)
+    if denied:
+        return denied
     
     return {
-        "message": f"Loaded {len(simplified_events)} events from common file",
-        "source": "common_file",
-        "events": simplified_events
+        "status": "success",
+        "storage": get_storage_stats()
+    }
+
+@app.post("/admin/storage/sweep")
+async def run_storage_sweep(request: Request):
+    """Apply the retention policies immediately instead of waiting for the background task"""
+    denied = check_admin_token(request)
+    if denied:
+        return denied
+    
+    for store in STORAGE_POLICIES:
+        await sweep_storage(store)
+    
+    return {
+        "status": "success",
+        "message": "Storage sweep completed",
+        "storage": get_storage_stats()
+    }
+
+@app.get("/audio/{file_name}")
+async def get_audio(file_name: str):
+    """Serve a generated event summary and mark it as recently used for storage eviction"""
+    audio_file_path = AUDIO_DIR / file_name
+    if audio_file_path.name != file_name or audio_file_path.suffix != ".wav":
+        return JSONResponse({"status": "error", "message": f"Invalid audio file: {file_name}"}, status_code=422)
+    
+    # Read in a worker thread; the file may be evicted at any point
+    try:
+        content = await asyncio.to_thread(audio_file_path.read_bytes)
+    except FileNotFoundError:
+        return JSONResponse({"status": "error", "message": f"Audio file not found: {file_name}"}, status_code=404)
+    
+    record_file_access("audio", audio_file_path)
+    return Response(content=content, media_type="audio/wav", headers={"Cache-Control": "public, max-age=3600"})
+
+@app.get("/stream")
+async def stream_updates(calendar: str = None, event_id: str = None):
+    """Server-sent events for calendar snapshot changes and per-event pipeline progress"""
+    if calendar and not resolve_calendar(calendar):
+        return JSONResponse({"status": "error", "message": f"Unknown calendar: {calendar}"}, status_code=404)
+    
+    async def event_stream():
+        subscriber_id = uuid.uuid4().hex
+        queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        add_sse_subscriber(subscriber_id, {"queue": queue, "calendar": calendar, "event_id": event_id})
+        try:
+            # Tell the client what it may have missed: the current snapshot versions, or
+            # the latest progress of the event it follows
+            if event_id:
+                yield format_sse("hello", {"pipeline": pipeline_states.get(event_id)})
+            else:
+                versions = {calendar_id: get_snapshot_version(calendar_id) for calendar_id in ([calendar] if calendar else CALENDARS)}
+                yield format_sse("hello", {"calendars": versions})
+            
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            remove_sse_subscriber(subscriber_id)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Running summary + speech pipelines, so a second request for the same event doesn't start another
+pipeline_tasks = {}
+
+async def run_event_pipeline(event_id):
+    try:
+        result = await create_summary({"eventId": event_id})
+        if result.get("status") == "success":
+            result = await text_to_speech({"summary": result["summary"], "eventId": event_id})
+        if result.get("status") != "success":
+            publish_pipeline_progress(event_id, "error", message=result.get("message"))
+    finally:
+        pipeline_tasks.pop(event_id, None)
+
+@app.post("/event-pipeline")
+async def start_event_pipeline(request: dict):
+    """Start summarizing and voicing an extracted event in the background; progress is sent on /stream"""
+    event_id = request.get("eventId")
+    if not event_id:
+        return {
+            "status": "error",
+            "message": "Missing eventId parameter"
+        }
+    
+    if not get_event_details_path(event_id):
+        return {
+            "status": "error",
+            "message": f"Event details file not found for ID: {event_id}"
+        }
+    
+    if event_id not in pipeline_tasks:
+        publish_pipeline_progress(event_id, "started")
+        pipeline_tasks[event_id] = asyncio.create_task(run_event_pipeline(event_id))
+    
+    return {
+        "status": "started",
+        "event_id": event_id,
+        "stream_url": f"/stream?event_id={quote(event_id, safe='')}"
+    }
+
+@app.get("/event-pipeline")
+async def get_event_pipeline(eventId: str = None):
+    """Latest pipeline progress for an event, for clients that missed stream updates"""
+    if not eventId:
+        return {
+            "status": "error",
+            "message": "Missing eventId parameter"
+        }
+    
+    return {
+        "status": "success",
+        "event_id": eventId,
+        "running": eventId in pipeline_tasks,
+        "pipeline": pipeline_states.get(eventId)
     }
 
 @app.post("/toolhouse-event")
@@ -293,15 +1156,16 @@ async def toolhouse_event(request: dict):
         EVENT_DETAILS_DIR.mkdir(exist_ok=True, parents=True)
         
         # Get the tools from Toolhouse - using the "fire" bundle for web scraping
-        tools = th.get_tools("fire")
+        tools = await asyncio.to_thread(th.get_tools, "fire")
         
         # Prepare messages for the model - simple and direct
         messages = [
             {"role": "user", "content": f"Visit and scrape the event page at {event_url}. Extract all text content including title, description, date, time, location, and other details."}
         ]
         
-        # Call Groq with Toolhouse tools
-        response = client.chat.completions.create(
+        # Call Groq with Toolhouse tools off the event loop
+        response = await asyncio.to_thread(
+            client.chat.completions.create,
             model=MODEL,
             messages=messages,
             tools=tools,
@@ -309,7 +1173,7 @@ async def toolhouse_event(request: dict):
         )
         
         # Run the tools based on the model's response
-        tool_results = th.run_tools(response)
+        tool_results = await asyncio.to_thread(th.run_tools, response)
         
         # Get the content directly from the tool results
         content = ""
@@ -321,7 +1185,8 @@ async def toolhouse_event(request: dict):
         
         # If we didn't get content from the tools, use a simple approach
         if not content:
-            simple_response = client.chat.completions.create(
+            simple_response = await asyncio.to_thread(
+                client.chat.completions.create,
                 model=MODEL,
                 messages=[{"role": "user", "content": f"Describe the event at {event_url} in detail."}],
                 temperature=0.1,
@@ -337,6 +1202,11 @@ async def toolhouse_event(request: dict):
             f.write(f"Extracted on: {datetime.now().isoformat()}\n\n")
             f.write(content)
         
+        # Drop any compressed copy from an earlier extraction
+        remove_stored_file("event-details", f"{event_file_path.name}.gz")
+        record_file_write("event-details", event_file_path)
+        publish_pipeline_progress(event_id, "extraction_done")
+        
         # Verify the file was saved
         file_exists = os.path.exists(str(event_file_path))
         
@@ -359,29 +1229,40 @@ async def toolhouse_event(request: dict):
     except Exception as e:
         import traceback
         print(f"ERROR IN TOOLHOUSE-EVENT: {str(e)}")
+        if event_url:
+            publish_pipeline_progress(event_url.split("/")[-1].split("?")[0], "error", message=str(e))
         return {
             "status": "error",
             "message": f"Error extracting event information: {str(e)}"
         }
     
 @app.get("/toolhouse")
-async def toolhouse_scrape():
+async def toolhouse_scrape(calendar: str = None):
     """Search for events based on user query"""
+    calendar_id = resolve_calendar(calendar)
+    if not calendar_id:
+        return {
+            "message": f"Unknown calendar: {calendar}",
+            "tool_results": []
+        }
+    
     # Prepare messages for the model
     messages = [
-        {"role": "user", "content": f"scrape {URL_TO_SCRAPE} and extract all events details including title, hosts, date, time, location, and image URLs"}
+        {"role": "user", "content": f"scrape {CALENDARS[calendar_id]['url']} and extract all events details including title, hosts, date, time, location, and image URLs"}
     ]
     
-    # Call Groq with Toolhouse tools
-    response = client.chat.completions.create(
+    # Call Groq with Toolhouse tools off the event loop
+    tools = await asyncio.to_thread(th.get_tools, "fire")
+    response = await asyncio.to_thread(
+        client.chat.completions.create,
         model=MODEL,
         messages=messages,
         # Passing a Bundle
-        tools=th.get_tools("fire"),
+        tools=tools,
     )
     
     # Run the tools based on the model's response
-    tool_results = th.run_tools(response)
+    tool_results = await asyncio.to_thread(th.run_tools, response)
     
     # Clean the tool results to ensure they're compatible with Groq
     cleaned_messages = messages.copy()
@@ -405,7 +1286,8 @@ async def toolhouse_scrape():
             })
     
     # Get a final response from the model with the cleaned tool results
-    final_response = client.chat.completions.create(
+    final_response = await asyncio.to_thread(
+        client.chat.completions.create,
         model=MODEL,
         messages=cleaned_messages,
     )
@@ -448,14 +1330,18 @@ async def transcribe_audio(request: dict):
                 "message": f"Audio file not found: {file_path}"
             }
         
-        # Read the audio file
-        with open(file_path, "rb") as audio_file:
-            # Call Groq's Whisper API for transcription
-            response = client.audio.transcriptions.create(
-                model=WHISPER,
-                file=audio_file,
-                language="en"  # Specify language if known, or let the model detect
-            )
+        record_file_access("voice-input", file_path)
+        
+        # Read the audio file and call Groq's Whisper API for transcription off the event loop
+        def transcribe():
+            with open(file_path, "rb") as audio_file:
+                return client.audio.transcriptions.create(
+                    model=WHISPER,
+                    file=audio_file,
+                    language="en"  # Specify language if known, or let the model detect
+                )
+        
+        response = await asyncio.to_thread(transcribe)
         
         # Extract the transcription text
         transcription = response.text if hasattr(response, 'text') else str(response)
@@ -487,6 +1373,7 @@ async def process_voice_input(
         file_path = UPLOAD_DIR / f"{hash_id}.webm"
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(audio_file.file, buffer)
+        record_file_write("voice-input", file_path)
         
         return {
             "status": "success",
@@ -512,17 +1399,16 @@ async def get_event_details(id: str = None):
             }
         
         # Check if we have a text file for this event
-        event_file_path = EVENT_DETAILS_DIR / f"{id}.txt"
+        event_file_path = get_event_details_path(id)
         
-        if not event_file_path.exists():
+        if not event_file_path:
             return {
                 "status": "error",
                 "message": f"No event details found for ID: {id}"
             }
         
         # Read the text file
-        with open(event_file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = read_event_details_file(event_file_path)
         
         # Parse the content to extract metadata
         lines = content.split("\n")
@@ -582,23 +1468,23 @@ async def create_summary(request: dict):
             }
         
         # Construct the path to the event file
-        event_file_path = EVENT_DETAILS_DIR / f"{event_id}.txt"
+        event_file_path = get_event_details_path(event_id)
         
         # Check if the file exists
-        if not event_file_path.exists():
+        if not event_file_path:
             return {
                 "status": "error",
                 "message": f"Event details file not found for ID: {event_id}"
             }
         
         # Read the file content
-        with open(event_file_path, "r", encoding="utf-8") as f:
-            file_content = f.read()
+        file_content = read_event_details_file(event_file_path)
         
         print(f"Creating summary for event {event_id}, content length: {len(file_content)} characters")
         
-        # Call Groq to clean up the content and generate a summary
-        completion = client.chat.completions.create(
+        # Call Groq to clean up the content and generate a summary off the event loop
+        completion = await asyncio.to_thread(
+            client.chat.completions.create,
             model=MODEL,
             messages=[
                 {
@@ -618,6 +1504,7 @@ async def create_summary(request: dict):
         summary = completion.choices[0].message.content if completion.choices else "No summary available"
         
         print(f"Generated summary for event {event_id}: {summary[:100]}...")
+        publish_pipeline_progress(event_id, "summary_ready", summary=summary)
         
         # Return the summary
         return {
@@ -688,10 +1575,21 @@ async def text_to_speech(request: dict):
         print(f"Using PlayHT voice: jennifersaad")
         print(f"Saving audio to: {audio_file_path}")
         
-        # Generate and save the audio file
-        with open(str(audio_file_path), "wb") as audio_file:
-            for chunk in client.tts(summary, options, voice_engine="PlayDialog-http"):
-                audio_file.write(chunk)
+        # Generate and save the audio file in a worker thread, reporting progress as chunks arrive
+        loop = asyncio.get_running_loop()
+        
+        def write_audio_file():
+            bytes_written = 0
+            last_progress = 0.0
+            with open(str(audio_file_path), "wb") as audio_file:
+                for chunk_index, chunk in enumerate(client.tts(summary, options, voice_engine="PlayDialog-http")):
+                    audio_file.write(chunk)
+                    bytes_written += len(chunk)
+                    if time.monotonic() - last_progress >= SSE_AUDIO_CHUNK_INTERVAL:
+                        last_progress = time.monotonic()
+                        loop.call_soon_threadsafe(publish_pipeline_progress, event_id, "audio_chunk", chunk=chunk_index, bytes=bytes_written)
+        
+        await asyncio.to_thread(write_audio_file)
         
         # Verify the file was saved
         if not os.path.exists(str(audio_file_path)):
@@ -703,10 +1601,12 @@ async def text_to_speech(request: dict):
             }
         
         file_size = os.path.getsize(str(audio_file_path))
+        record_file_write("audio", audio_file_path)
         print(f"Audio file saved to: {audio_file_path} (size: {file_size} bytes)")
         
         # Create a relative URL path for the frontend
         relative_audio_path = f"/audio/{audio_filename}"
+        publish_pipeline_progress(event_id, "audio_ready", audio_url=relative_audio_path, file_size=file_size)
         
         return {
             "status": "success",
@@ -0,0 +1,75 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const url = searchParams.get('url');
+    
+    if (!url) {
+      return NextResponse.json(
+        {
+          status: "error",
+          message: "Missing required parameter: url"
+        },
+        { status: 422 }
+      );
+    }
+    
+    // Get the backend URL from environment variables
+    const backendUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+    const imageUrl = `${backendUrl}/image?${searchParams.toString()}`;
+    
+    // Forward the headers the backend uses for format negotiation and revalidation
+    const headers: Record<string, string> = {
+      'Accept': request.headers.get('accept') || 'image/webp, image/*',
+    };
+    const ifNoneMatch = request.headers.get('if-none-match');
+    if (ifNoneMatch) {
+      headers['If-None-Match'] = ifNoneMatch;
+    }
+    
+    const response = await fetch(imageUrl, { method: 'GET', headers });
+    
+    // Pass the backend's long-lived cache headers through to the browser
+    const responseHeaders: Record<string, string> = {};
+    for (const name of ['Content-Type', 'Cache-Control', 'ETag', 'Vary']) {
+      const value = response.headers.get(name);
+      if (value) {
+        responseHeaders[name] = value;
+      }
+    }
+    
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: responseHeaders });
+    }
+    
+    if (!response.ok) {
+      console.error(`Backend returned status ${response.status} for image ${url}`);
+      return NextResponse.json(
+        { 
+          status: "error", 
+          message: `Image not available: ${url}` 
+        }, 
+        { status: response.status }
+      );
+    }
+    
+    const imageBuffer = await response.arrayBuffer();
+    
+    return new NextResponse(imageBuffer, {
+      headers: {
+        ...responseHeaders,
+        'Content-Length': imageBuffer.byteLength.toString(),
+      },
+    });
+  } catch (error) {
+    console.error('API error:', error);
+    return NextResponse.json(
+      { 
+        status: "error", 
+        message: 'Failed to fetch image' 
+      }, 
+      { status: 500 }
+    );
+  }
+}
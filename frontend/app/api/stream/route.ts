@@ -0,0 +1,54 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+// Server-sent events must not be cached or buffered by Next.js
+export const dynamic = 'force-dynamic';
+
+export async function GET(request: NextRequest) {
+  try {
+    // Get the backend URL from environment variables
+    const backendUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+    
+    // Handle query parameters (calendar, event_id)
+    const searchParams = request.nextUrl.searchParams.toString();
+    const queryString = searchParams ? `?${searchParams}` : '';
+    const url = `${backendUrl}/stream${queryString}`;
+    
+    // Close the backend stream when the browser disconnects
+    const response = await fetch(url, {
+      method: 'GET',
+      headers: {
+        'Accept': 'text/event-stream',
+      },
+      signal: request.signal,
+    });
+    
+    if (!response.ok || !response.body) {
+      console.error(`Backend returned status ${response.status} for event stream`);
+      return NextResponse.json(
+        { 
+          status: "error", 
+          message: `Backend error: ${response.statusText}` 
+        }, 
+        { status: response.status }
+      );
+    }
+    
+    // Pipe the backend stream straight through to the browser
+    return new Response(response.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        'Connection': 'keep-alive',
+      },
+    });
+  } catch (error) {
+    console.error('API error:', error);
+    return NextResponse.json(
+      { 
+        status: "error", 
+        message: 'Failed to open event stream' 
+      }, 
+      { status: 500 }
+    );
+  }
+}
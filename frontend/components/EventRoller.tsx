@@ -14,6 +14,9 @@ interface Event {
   event_url: string;
 }
 
+// Calendar shown in the roller
+const CALENDAR = process.env.NEXT_PUBLIC_CALENDAR || 'sxsw'
+
 interface EventRollerProps {
   onEventSelect: (eventName: string, eventDetails?: any) => void
 }
@@ -29,34 +32,70 @@ export default function EventRoller({ onEventSelect }: EventRollerProps) {
   const [error, setError] = useState<string | null>(null)
   const [processingEvent, setProcessingEvent] = useState<string | null>(null)
   const controls = useAnimation()
+  // Snapshot version currently on screen (undefined until the first fetch completes)
+  const loadedVersionRef = useRef<string | null | undefined>(undefined)
   
   // Fetch events from the backend
   useEffect(() => {
-    const fetchEvents = async () => {
-      setIsLoading(true);
+    // Background refreshes keep the current roller on screen instead of the loading state
+    const fetchEvents = async (isRefresh = false) => {
+      if (!isRefresh) {
+        setIsLoading(true);
+      }
       try {
-        const response = await fetch('/api/events-list');
+        const response = await fetch(`/api/events-list?calendar=${encodeURIComponent(CALENDAR)}`);
         if (!response.ok) {
           throw new Error(`Error: ${response.status}`);
         }
         const data = await response.json();
+        loadedVersionRef.current = data.timestamp ?? null;
         
         // Store full event objects
         if (data.events && data.events.length > 0) {
           setEvents(data.events);
+          setError(null);
+        } else if (data.source === 'scraping') {
+          // The backend is scraping in the background and will publish a snapshot when done
+          setEvents([{ title: "Scraping events..." } as Event]);
+          setError(null);
         } else {
           setEvents([{ title: "No events found" } as Event]);
         }
       } catch (err) {
         console.error('Failed to fetch events:', err);
-        setError(err instanceof Error ? err.message : 'An unknown error occurred');
-        setEvents([{ title: "Error loading events" } as Event]);
+        // A failed refresh keeps the events we already have
+        if (!isRefresh) {
+          setError(err instanceof Error ? err.message : 'An unknown error occurred');
+          setEvents([{ title: "Error loading events" } as Event]);
+        }
       } finally {
         setIsLoading(false);
       }
     };
     
     fetchEvents();
+
+    // Refetch when the backend publishes a new snapshot of this calendar instead of polling
+    const eventSource = new EventSource(`/api/stream?calendar=${encodeURIComponent(CALENDAR)}`);
+    eventSource.addEventListener('hello', (message) => {
+      // On (re)connect, catch up on any snapshot published while we were not listening
+      const { calendars } = JSON.parse((message as MessageEvent).data);
+      const version = calendars?.[CALENDAR] ?? null;
+      if (loadedVersionRef.current !== undefined && version !== loadedVersionRef.current) {
+        fetchEvents(true);
+      }
+    });
+    eventSource.addEventListener('snapshot', () => fetchEvents(true));
+    eventSource.addEventListener('resync', () => fetchEvents(true));
+    eventSource.addEventListener('scrape_error', (message) => {
+      const { message: scrapeError } = JSON.parse((message as MessageEvent).data);
+      console.error('Background scrape failed:', scrapeError);
+      // Only replace the roller if we have no events to show yet
+      setEvents((current) => current.some((event) => event.event_url) ? current : [{ title: "Error loading events" } as Event]);
+      setError(scrapeError);
+    });
+
+    return () => eventSource.close();
   }, []);
   
   // Duplicate the events to create a seamless loop
@@ -22,6 +22,7 @@ export default function Results() {
   const [audioUrl, setAudioUrl] = useState<string | null>(null)
   const [isPlaying, setIsPlaying] = useState<boolean>(false)
   const [audioLoading, setAudioLoading] = useState<boolean>(false)
+  const [audioProgress, setAudioProgress] = useState<number>(0)
   const [audioError, setAudioError] = useState<boolean>(false)
   const [audioErrorMessage, setAudioErrorMessage] = useState<string | null>(null)
   
@@ -39,6 +40,9 @@ export default function Results() {
   }, [eventName, eventId, imageUrl, hasError]);
 
   useEffect(() => {
+    let eventSource: EventSource | null = null;
+    let cancelled = false;
+    
     // If we have an eventId, fetch the event details
     const fetchEventDetails = async () => {
       if (!eventId) {
@@ -75,94 +79,123 @@ export default function Results() {
         
         setEventDetails(data);
         
-        // Now that we have the event details, clean them up
+        // The user may have navigated away while the details were loading
+        if (cancelled) return;
+        
+        // Summary and audio are generated in the background; follow their progress over the event stream
         setCleaningContent(true);
-        try {
-          console.log("Calling /api/groq-clean with eventId:", eventId);
-          
-          const cleanResponse = await fetch('/api/groq-clean', {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ eventId }),
-          });
-          
-          console.log("Clean response status:", cleanResponse.status);
+        eventSource = new EventSource(`/api/stream?event_id=${encodeURIComponent(eventId)}`);
+        
+        // Apply a progress frame, or the latest progress the backend kept for this event
+        const applyProgress = (progress: any) => {
+          if (progress.summary) {
+            setSummary(progress.summary);
+            setCleaningContent(false);
+          }
           
-          if (!cleanResponse.ok) {
-            const cleanErrorText = await cleanResponse.text();
-            console.error("Clean error response:", cleanErrorText);
-            throw new Error(`Failed to clean content: ${cleanResponse.statusText}`);
+          if (progress.stage === "summary_ready") {
+            setAudioLoading(true);
+          } else if (progress.stage === "audio_chunk") {
+            setCleaningContent(false);
+            setAudioLoading(true);
+            setAudioProgress(progress.bytes);
+          } else if (progress.stage === "audio_ready") {
+            // Get the backend URL from environment variables or use default
+            const backendUrl = process.env.NEXT_PUBLIC_NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+            
+            // Set the direct URL to the audio file on the backend
+            const audioFileUrl = `${backendUrl}/audio/${eventId}.wav`;
+            console.log("Setting audio URL to:", audioFileUrl);
+            setAudioUrl(audioFileUrl);
+            setAudioError(false);
+            setAudioErrorMessage(null);
+            setCleaningContent(false);
+            setAudioLoading(false);
+            eventSource?.close();
+          } else if (progress.stage === "error") {
+            console.error("Pipeline error:", progress.message);
+            // Continue with the raw content or text summary even if a later step fails
+            setCleaningContent(false);
+            setAudioLoading(false);
+            setAudioError(true);
+            setAudioErrorMessage("Error generating audio: " + (progress.message || "Unknown error"));
+            eventSource?.close();
           }
+        };
+        
+        const startPipeline = async () => {
+          try {
+            console.log("Calling /api/event-pipeline with eventId:", eventId);
+            const pipelineResponse = await fetch('/api/event-pipeline', {
+              method: 'POST',
+              headers: {
+                'Content-Type': 'application/json',
+              },
+              body: JSON.stringify({ eventId }),
+            });
+            
+            const pipelineData = await pipelineResponse.json();
+            console.log("Received pipeline data:", pipelineData);
+            
+            if (!pipelineResponse.ok || pipelineData.status === "error") {
+              throw new Error(pipelineData.message || `Failed to start pipeline: ${pipelineResponse.statusText}`);
+            }
+          } catch (pipelineErr) {
+            console.error('Error starting pipeline:', pipelineErr);
+            // We still have the raw content, so don't set an error
+            setCleaningContent(false);
+            eventSource?.close();
+          }
+        };
+        
+        // The first hello tells us whether a run is already under way or finished; later
+        // ones (after a reconnect) replay whatever progress we missed
+        let pipelineStarted = false;
+        eventSource.addEventListener('hello', (message) => {
+          const { pipeline } = JSON.parse((message as MessageEvent).data);
           
-          const cleanData = await cleanResponse.json();
-          console.log("Received clean data:", cleanData);
-          setSummary(cleanData.summary);
+          if (!pipelineStarted) {
+            pipelineStarted = true;
+            // Start the pipeline once the stream is open so no progress event is missed
+            if (!pipeline || pipeline.stage === "extraction_done" || pipeline.stage === "error") {
+              startPipeline();
+              return;
+            }
+          }
           
-          // Now call the PlayHT endpoint to convert the summary to speech
-          if (cleanData.summary) {
-            console.log("Calling /api/playht with summary and eventId:", eventId);
-            setAudioLoading(true);
-            try {
-              const playhtResponse = await fetch('/api/playht', {
-                method: 'POST',
-                headers: {
-                  'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ 
-                  summary: cleanData.summary,
-                  eventId 
-                }),
-              });
-              
-              console.log("PlayHT response status:", playhtResponse.status);
-              
-              if (!playhtResponse.ok) {
-                const playhtErrorText = await playhtResponse.text();
-                console.error("PlayHT error response:", playhtErrorText);
-                console.warn("Failed to convert summary to speech, but continuing with text summary");
-                setAudioError(true);
-                setAudioErrorMessage("Failed to generate audio: " + playhtResponse.statusText);
-              } else {
-                const playhtData = await playhtResponse.json();
-                console.log("Received PlayHT data:", playhtData);
-                
-                if (playhtData.status === "success" && playhtData.audio_url) {
-                  // Get the backend URL from environment variables or use default
-                  const backendUrl = process.env.NEXT_PUBLIC_NEXT_PUBLIC_API_URL || 'http://localhost:8000';
-                  
-                  // Set the direct URL to the audio file on the backend
-                  const audioFileUrl = `${backendUrl}/audio/${eventId}.wav`;
-                  console.log("Setting audio URL to:", audioFileUrl);
-                  setAudioUrl(audioFileUrl);
-                  setAudioError(false);
-                  setAudioErrorMessage(null);
-                } else if (playhtData.status === "error") {
-                  console.error("PlayHT error:", playhtData.message);
-                  setAudioError(true);
-                  setAudioErrorMessage(playhtData.message || "Failed to generate audio");
-                } else {
-                  console.error("Invalid PlayHT response:", playhtData);
-                  setAudioError(true);
-                  setAudioErrorMessage("Invalid response from audio service");
-                }
-              }
-            } catch (playhtErr) {
-              console.error('Error calling PlayHT:', playhtErr);
-              // Continue with text summary even if speech conversion fails
-              setAudioError(true);
-              setAudioErrorMessage("Error generating audio: " + (playhtErr instanceof Error ? playhtErr.message : "Unknown error"));
-            } finally {
-              setAudioLoading(false);
+          if (pipeline) {
+            applyProgress(pipeline);
+          }
+        });
+        
+        eventSource.addEventListener('pipeline', (message) => {
+          const progress = JSON.parse((message as MessageEvent).data);
+          console.log("Pipeline progress:", progress);
+          applyProgress(progress);
+        });
+        
+        // The stream fell behind and dropped updates: catch up from the stored progress
+        eventSource.addEventListener('resync', async () => {
+          try {
+            const stateResponse = await fetch(`/api/event-pipeline?eventId=${encodeURIComponent(eventId)}`);
+            const stateData = await stateResponse.json();
+            if (stateData.pipeline) {
+              applyProgress(stateData.pipeline);
             }
+          } catch (resyncErr) {
+            console.error('Error fetching pipeline progress:', resyncErr);
           }
-        } catch (cleanErr) {
-          console.error('Error cleaning content:', cleanErr);
-          // We still have the raw content, so don't set an error
-        } finally {
-          setCleaningContent(false);
-        }
+        });
+        
+        // EventSource reconnects on its own; only give up once it stops trying
+        eventSource.onerror = () => {
+          if (eventSource?.readyState === EventSource.CLOSED) {
+            setCleaningContent(false);
+            setAudioLoading(false);
+            setAudioError(true);
+            setAudioErrorMessage("Lost connection while generating audio");
+          }
+        };
       } catch (err) {
         console.error('Error fetching event details:', err);
         setError(err instanceof Error ? err.message : 'An unknown error occurred');
@@ -172,6 +205,11 @@ export default function Results() {
     }
     
     fetchEventDetails();
+    
+    return () => {
+      cancelled = true;
+      eventSource?.close();
+    };
   }, [eventId]);
 
   // Toggle play/pause
@@ -377,7 +415,9 @@ export default function Results() {
                       {audioLoading ? (
                         <div className="flex items-center">
                           <div className="animate-spin rounded-full h-5 w-5 border-t-2 border-b-2 border-cyan-500 mr-2"></div>
-                          <span className="text-xs text-cyan-400">Generating audio...</span>
+                          <span className="text-xs text-cyan-400">
+                            Generating audio...{audioProgress > 0 && ` ${Math.round(audioProgress / 1024)} KB`}
+                          </span>
                         </div>
                       ) : audioError ? (
                         <div className="text-xs text-amber-400">